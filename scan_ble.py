@@ -19,14 +19,17 @@ async def scan_devices():
             print("No BLE devices found!")
             return
         
-        print("\nFound devices:")
+        # Build the report in memory and emit it with a single write, rather
+        # than several print syscalls per device
+        lines = ["\nFound devices:"]
         for d in devices:
-            print(f"Name: {d.name or 'Unknown'}")
-            print(f"Address: {d.address}")
-            print(f"RSSI: {d.rssi}dBm")
+            lines.append(f"Name: {d.name or 'Unknown'}")
+            lines.append(f"Address: {d.address}")
+            lines.append(f"RSSI: {d.rssi}dBm")
             if d.metadata:
-                print("Metadata:", d.metadata)
-            print("-" * 50)
+                lines.append(f"Metadata: {d.metadata}")
+            lines.append("-" * 50)
+        print("\n".join(lines))
     
     except BleakError as e:
         print(f"Bluetooth error: {e}")
@@ -5,11 +5,17 @@ import sys
 import os
 import matplotlib
 
-# Use Agg backend for testing, TkAgg for normal use
-if 'PYTEST_CURRENT_TEST' in os.environ:
-    matplotlib.use('Agg')
-else:
-    matplotlib.use('TkAgg')
+# Select the backend exactly once at import. An explicit MPLBACKEND wins;
+# under pytest the non-interactive Agg backend is used; otherwise prefer
+# TkAgg and fall back to Agg on headless systems without Tk.
+if 'MPLBACKEND' not in os.environ:
+    if 'pytest' in sys.modules or 'PYTEST_CURRENT_TEST' in os.environ:
+        matplotlib.use('Agg')
+    else:
+        try:
+            matplotlib.use('TkAgg')
+        except ImportError:
+            matplotlib.use('Agg')
 from polar_h10 import PolarH10, HeartRateDisplay, DataLogger
 from bleak.exc import BleakError
 
@@ -55,12 +61,15 @@ async def main(device_id, polar=None, hr_display=None, data_logger=None):
                 await asyncio.sleep(2)
         
         logger.info("Successfully connected to Polar H10")
-        callback = lambda hr: asyncio.create_task(hr_callback(hr_display, data_logger, hr))
-        await polar.start_hr_monitoring(callback)
-        
-        # Keep the script running
-        while True:
-            await asyncio.sleep(1)
+
+        async def on_heart_rate(hr, stats):
+            await hr_callback(hr_display, data_logger, hr)
+
+        await polar.start_hr_monitoring(on_heart_rate)
+
+        # Park until cancelled instead of waking once a second; the event is
+        # never set, so this only returns via cancellation/KeyboardInterrupt
+        await asyncio.Event().wait()
     except KeyboardInterrupt:
         logger.info("Shutting down...")
     finally:
@@ -1,6 +1,7 @@
 from .polar_device import PolarH10
 from .visualization import HeartRateDisplay
+from .ecg_visualization import ECGVisualizer
 from .data_logger import DataLogger
+from .ring_buffer import SPSCRing
 
-__all__ = ['PolarH10', 'HeartRateDisplay', 'DataLogger']
-
+__all__ = ['PolarH10', 'HeartRateDisplay', 'ECGVisualizer', 'DataLogger', 'SPSCRing']
@@ -0,0 +1,41 @@
+"""One-pass gap/anomaly scan over a DataQuality window.
+
+The loop is JIT-compiled with numba when it is installed; numba is not a
+project dependency, so a plain-Python fallback of the identical function
+is used otherwise. Keeping the kernel free of object-mode constructs
+(no datetime, no attribute access) is what lets the same source compile
+under njit.
+"""
+
+def _scan_window(ts_ns, hr, n):
+    """Count gaps and anomalies across one contiguous reading window.
+
+    Args:
+        ts_ns: int64 timestamps in nanoseconds, oldest first
+        hr: heart rates aligned with ts_ns
+        n: number of live readings
+
+    Returns:
+        (gaps, anomalies, quality) where quality is the fraction of
+        clean readings scaled to 0..100
+    """
+    gaps = 0
+    anomalies = 0
+    for i in range(1, n):
+        if ts_ns[i] - ts_ns[i - 1] > 1_100_000_000:  # Expected rate is ~1 Hz
+            gaps += 1
+        delta = hr[i] - hr[i - 1]
+        if delta < 0:
+            delta = -delta
+        if delta > 20 or hr[i] < 30 or hr[i] > 240:
+            anomalies += 1
+    if n == 0:
+        return 0, 0, 100.0
+    return gaps, anomalies, 100.0 * (1.0 - (gaps + anomalies) / n)
+
+try:
+    from numba import njit
+except ImportError:
+    scan_window = _scan_window
+else:
+    scan_window = njit(cache=True)(_scan_window)
@@ -1,42 +1,141 @@
-import csv
 from datetime import datetime
 import os
+import struct
+import time
+
+import numpy as np
+
+# Binary log layout: magic header, then tagged records. HR records carry the
+# epoch timestamp and bpm; ECG records carry the timestamp and sample count
+# followed by that many float32 microvolt samples.
+BIN_MAGIC = b'PH10LOG1'
+
+# Encoded once at import; every new CSV log reuses the same header bytes
+CSV_HEADER = b'Timestamp,HeartRate\r\n'
+HR_RECORD = struct.Struct('<Bdh')   # tag, epoch seconds, bpm
+ECG_RECORD = struct.Struct('<BdH')  # tag, epoch seconds, sample count
+HR_TAG = 1
+ECG_TAG = 2
 
 class DataLogger:
     """Data logging functionality for Polar H10."""
-    
-    def __init__(self, log_dir="data"):
+
+    FLUSH_INTERVAL = 64  # default rows written between explicit flushes
+
+    __slots__ = ('log_dir', 'current_file', 'flush_every', 'binary', '_fh',
+                 '_pending', '_pending_rows', '_ts_second', '_ts_prefix')
+
+    def __init__(self, log_dir="data", flush_every=FLUSH_INTERVAL, binary=False):
+        """Initialize the logger.
+
+        Args:
+            log_dir: Directory the log files are written to
+            flush_every: Rows collected before they are written and flushed
+            binary: Write fixed-size packed records instead of CSV text;
+                roughly a third of the bytes per ECG sample and no string
+                formatting in the hot path
+        """
         self.log_dir = log_dir
+        self.flush_every = flush_every
+        self.binary = binary
         os.makedirs(log_dir, exist_ok=True)
+        self._fh = None
+        # Scratch buffer: rows accumulate here and reach the file in one
+        # write per flush_every rows instead of one write call per row
+        self._pending = bytearray()
+        self._pending_rows = 0
+        self._ts_second = -1
+        self._ts_prefix = ''
         self.start_new_log()
-    
+
     def _init_csv(self):
-        """Initialize CSV file with headers."""
+        """Open the log file and write the CSV (or binary magic) header."""
         try:
-            with open(self.current_file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['Timestamp', 'HeartRate'])
+            self._fh = open(self.current_file, 'wb', buffering=1 << 16)
+            self._fh.write(BIN_MAGIC if self.binary else CSV_HEADER)
+            self._fh.flush()
         except IOError as e:
             raise RuntimeError(f"Failed to initialize CSV file: {e}")
-    
+
     def generate_filename(self):
         """Generate a new filename for the log file."""
+        suffix = 'bin' if self.binary else 'csv'
         return os.path.join(
             self.log_dir,
-            f"polar_h10_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            f"polar_h10_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{suffix}"
         )
 
     def start_new_log(self):
         """Start a new log file."""
+        self.close()
         self.current_file = self.generate_filename()
         self._init_csv()
 
     def log_heart_rate(self, hr):
-        """Log heart rate data."""
+        """Log heart rate data.
+
+        The two-column schema never needs quoting or escaping, so rows are
+        formatted straight to bytes without the csv module. Rows collect in
+        the scratch buffer and hit the file every flush_every rows; call
+        flush() or close() to force a write.
+        """
         try:
-            with open(self.current_file, 'a', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow([datetime.now().isoformat(), hr])
+            if self.binary:
+                self._pending += HR_RECORD.pack(HR_TAG, time.time(), hr)
+            else:
+                self._pending += f'{self._timestamp()},{hr}\r\n'.encode('ascii')
+            self._pending_rows += 1
+            if self._pending_rows >= self.flush_every:
+                self.flush()
         except IOError as e:
             raise RuntimeError(f"Failed to log heart rate data: {e}")
 
+    def log_ecg_frame(self, samples):
+        """Log one ECG frame of microvolt samples.
+
+        All rows in the frame share its arrival timestamp and are appended
+        to the scratch buffer in one go, so the flush bookkeeping runs once
+        per BLE notification rather than once per sample. In binary mode
+        the whole frame is one packed record.
+        """
+        try:
+            if self.binary:
+                self._pending += ECG_RECORD.pack(ECG_TAG, time.time(), len(samples))
+                self._pending += np.asarray(samples, dtype='<f4').tobytes()
+            else:
+                ts = self._timestamp()
+                self._pending += ''.join(f'{ts},{v}\r\n' for v in samples).encode('ascii')
+            self._pending_rows += len(samples)
+            if self._pending_rows >= self.flush_every:
+                self.flush()
+        except IOError as e:
+            raise RuntimeError(f"Failed to log ECG frame: {e}")
+
+    def _timestamp(self):
+        """Build an ISO-8601 timestamp without allocating a datetime object.
+
+        The strftime prefix only changes once per second, so it is cached
+        and rows within the same second just format their microseconds.
+        """
+        now = time.time()
+        second = int(now)
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(second))
+        return f"{self._ts_prefix}.{int((now - second) * 1e6):06d}"
+
+    def flush(self):
+        """Write any pending rows and flush them to disk."""
+        if self._fh and not self._fh.closed:
+            if self._pending:
+                self._fh.write(self._pending)
+                self._pending.clear()
+            self._fh.flush()
+        self._pending_rows = 0
+
+    def close(self):
+        """Flush and close the current log file."""
+        if self._fh and not self._fh.closed:
+            self.flush()
+            self._fh.close()
+        self._fh = None
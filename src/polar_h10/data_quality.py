@@ -1,84 +1,178 @@
-from collections import deque
 from datetime import datetime, timedelta
-import statistics
 import logging
 
+import numpy as np
+
+from ._quality_kernel import scan_window
+
 class DataQuality:
     """Handles data quality monitoring and buffering for Polar H10."""
-    
+
+    QUALITY_WINDOW = 10  # readings averaged for the signal quality score
+
+    __slots__ = ('logger', 'buffer_size', '_ts', '_hr', '_q', '_idx', '_n',
+                 'signal_quality', 'last_update', 'data_gaps', 'anomalies',
+                 '_q_ring', '_q_idx', '_q_count', '_q_sum',
+                 '_hr_sum', '_hr_sumsq', '_stats')
+
     def __init__(self, buffer_size=60):
         self.logger = logging.getLogger(__name__)
-        self.buffer = deque(maxlen=buffer_size)
+        self.buffer_size = buffer_size
+        # Structure-of-arrays ring buffer: parallel fixed-size arrays with a
+        # shared write index, avoiding per-reading tuple allocation.
+        self._ts = np.empty(buffer_size, dtype='datetime64[ms]')
+        self._hr = np.empty(buffer_size, dtype=np.int16)
+        self._q = np.empty(buffer_size, dtype=np.float32)
+        self._idx = 0
+        self._n = 0
         self.signal_quality = 100.0
         self.last_update = None
         self.data_gaps = 0
         self.anomalies = 0
-        
+        # Ring buffer holding the last QUALITY_WINDOW quality scores plus a
+        # running sum, so the rolling average updates in O(1) per reading.
+        self._q_ring = [0.0] * self.QUALITY_WINDOW
+        self._q_idx = 0
+        self._q_count = 0
+        self._q_sum = 0.0
+        # Running sum / sum of squares over the live window; updated on every
+        # insert and eviction so get_stats never rescans the buffer. Exact,
+        # since heart rates are integers.
+        self._hr_sum = 0
+        self._hr_sumsq = 0
+        # Reused by get_stats so the per-notification hot path does not
+        # allocate a fresh dict per call
+        self._stats = {
+            'signal_quality': 0.0,
+            'data_gaps': 0,
+            'anomalies': 0,
+            'mean_hr': 0.0,
+            'std_dev': 0.0,
+            'buffer_size': 0
+        }
+
+    @property
+    def buffer(self):
+        """Materialize the ring buffer as (timestamp, heart_rate, quality) tuples.
+
+        Intended for inspection and tests; the hot path works on the
+        underlying arrays directly.
+        """
+        order = (np.arange(self._idx - self._n, self._idx) % self.buffer_size)
+        return [(self._ts[i].item(), int(self._hr[i]), float(self._q[i])) for i in order]
+
     def add_reading(self, timestamp, heart_rate):
         """Add a new heart rate reading and analyze its quality."""
         current_quality = self._calculate_quality(timestamp, heart_rate)
-        self.buffer.append((timestamp, heart_rate, current_quality))
-        self._update_signal_quality()
+        if self._n == self.buffer_size:
+            evicted = int(self._hr[self._idx])
+            self._hr_sum -= evicted
+            self._hr_sumsq -= evicted * evicted
+        self._hr_sum += heart_rate
+        self._hr_sumsq += heart_rate * heart_rate
+        self._ts[self._idx] = np.datetime64(timestamp, 'ms')
+        self._hr[self._idx] = heart_rate
+        self._q[self._idx] = current_quality
+        self._idx = (self._idx + 1) % self.buffer_size
+        self._n = min(self.buffer_size, self._n + 1)
+        self._q_sum += current_quality - self._q_ring[self._q_idx]
+        self._q_ring[self._q_idx] = current_quality
+        self._q_idx = (self._q_idx + 1) % self.QUALITY_WINDOW
+        self._q_count = min(self.QUALITY_WINDOW, self._q_count + 1)
+        self.signal_quality = self._q_sum / self._q_count
         self.last_update = timestamp
-        
+
     def get_stats(self):
-        """Get current data quality statistics."""
-        if not self.buffer:
+        """Get current data quality statistics.
+
+        Returns a dict reused across calls; callers that need to keep a
+        snapshot should copy it.
+        """
+        if self._n == 0:
             return None
-            
-        readings = [hr for _, hr, _ in self.buffer]
-        return {
-            'signal_quality': self.signal_quality,
-            'data_gaps': self.data_gaps,
-            'anomalies': self.anomalies,
-            'mean_hr': statistics.mean(readings),
-            'std_dev': statistics.stdev(readings) if len(readings) > 1 else 0,
-            'buffer_size': len(self.buffer)
-        }
-        
+
+        n = self._n
+        mean_hr = self._hr_sum / n
+        stats = self._stats
+        stats['signal_quality'] = self.signal_quality
+        stats['data_gaps'] = self.data_gaps
+        stats['anomalies'] = self.anomalies
+        stats['mean_hr'] = mean_hr
+        # Sample standard deviation, matching statistics.stdev
+        stats['std_dev'] = (max(0.0, self._hr_sumsq - n * mean_hr * mean_hr) / (n - 1)) ** 0.5 if n > 1 else 0
+        stats['buffer_size'] = n
+        return stats
+
+    def window_anomaly_count(self):
+        """Count readings in the live window outside the plausible HR band.
+
+        Unlike the lifetime anomalies counter this only looks at what is
+        still buffered, using a vectorized boolean mask over the HR ring
+        rather than a Python loop. Kept out of get_stats so the
+        per-notification path stays O(1).
+        """
+        window = self._hr[:self._n]
+        return int(np.count_nonzero((window < 30) | (window > 240)))
+
+    def window_scan(self):
+        """Re-derive gap and anomaly counts over the live window in one pass.
+
+        Complements the lifetime counters, which never forget: this looks
+        only at what is still buffered. The scan runs as a single fused
+        loop (numba-compiled when numba is installed, plain Python
+        otherwise) rather than separate masked passes per condition.
+
+        Returns:
+            (gaps, anomalies, quality) for the buffered window, where
+            quality is the fraction of clean readings scaled to 0..100
+        """
+        order = (np.arange(self._idx - self._n, self._idx) % self.buffer_size)
+        ts_ns = self._ts[order].astype('datetime64[ns]').astype(np.int64)
+        hr = self._hr[order].astype(np.int64)
+        return scan_window(ts_ns, hr, self._n)
+
     def _calculate_quality(self, timestamp, heart_rate):
-        """Calculate quality score for a single reading."""
+        """Calculate quality score for a single reading.
+
+        Each check is an arithmetic predicate: the penalty term multiplies
+        to zero when the condition is false, so the hot path runs straight
+        through without data-dependent branches.
+        """
         quality = 100.0
-        
+
         # Check for data gaps
-        if self.last_update:
+        if self.last_update is not None:
             time_gap = (timestamp - self.last_update).total_seconds()
-            if time_gap > 1.1:  # Expected update rate is ~1s
-                self.data_gaps += 1
-                quality -= min(50, time_gap * 10)  # Reduce quality based on gap size
-        
+            gapped = time_gap > 1.1  # Expected update rate is ~1s
+            self.data_gaps += gapped
+            quality -= gapped * min(50.0, time_gap * 10)  # Reduce quality based on gap size
+
         # Check for physiological plausibility
-        if not (30 <= heart_rate <= 240):
-            self.anomalies += 1
-            quality -= 50
-        
-        # Check for sudden changes
-        if len(self.buffer) > 0:
-            last_hr = self.buffer[-1][1]
+        anomalous = not (30 <= heart_rate <= 240)
+        self.anomalies += anomalous
+        quality -= anomalous * 50.0
+
+        # Check for sudden changes against the newest ring slot
+        if self._n > 0:
+            last_hr = int(self._hr[(self._idx - 1) % self.buffer_size])
             hr_change = abs(heart_rate - last_hr)
-            if hr_change > 20:  # Sudden change threshold
-                self.anomalies += 1
-                quality -= min(30, hr_change)
-                
+            sudden = hr_change > 20  # Sudden change threshold
+            self.anomalies += sudden
+            quality -= sudden * min(30.0, hr_change)
+
         return max(0.0, quality)
-        
-    def _update_signal_quality(self):
-        """Update overall signal quality based on recent readings."""
-        if not self.buffer:
-            return
-            
-        # Convert deque to list for slicing
-        buffer_list = list(self.buffer)
-        # Get last 10 readings or all if less than 10
-        recent_readings = buffer_list[-min(10, len(buffer_list)):]
-        recent_quality = [q for _, _, q in recent_readings]
-        self.signal_quality = statistics.mean(recent_quality)
-        
+
     def clear(self):
         """Clear all stored data."""
-        self.buffer.clear()
+        self._idx = 0
+        self._n = 0
         self.signal_quality = 100.0
         self.data_gaps = 0
         self.anomalies = 0
         self.last_update = None
-
+        self._q_ring = [0.0] * self.QUALITY_WINDOW
+        self._q_idx = 0
+        self._q_count = 0
+        self._q_sum = 0.0
+        self._hr_sum = 0
+        self._hr_sumsq = 0
@@ -1,9 +1,11 @@
 import logging
-from typing import Callable, Optional
-from bleak import BleakClient
-from dataclasses import dataclass
-from enum import Enum
+import queue
 import struct
+import threading
+from typing import Callable, NamedTuple, Optional
+from bleak import BleakClient
+
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +14,16 @@ PMD_SERVICE = "FB005C80-02E7-F387-1CAD-8ACD2D8DF0C8"
 PMD_CONTROL = "FB005C81-02E7-F387-1CAD-8ACD2D8DF0C8"
 PMD_DATA = "FB005C82-02E7-F387-1CAD-8ACD2D8DF0C8"
 
+# Scale factor converting raw 24-bit samples to microvolts
+ECG_SCALE_UV = np.float32(0.25)
+
+# Compiled once at import; decodes the 16-bit frame timestamp in place
+_FRAME_TS_STRUCT = struct.Struct('<H')
+
+# Scratch capacity for the reusable decode buffers; a notification carries at
+# most ~73 samples, so frames larger than this fall back to allocating.
+_MAX_FRAME_SAMPLES = 256
+
 class ECGError(Exception):
     """Base exception for ECG-related errors."""
     pass
@@ -24,118 +36,267 @@ class ECGControlError(ECGError):
     """Exception raised for errors in ECG control operations."""
     pass
 
-@dataclass
-class ECGMeasurement:
-    """Represents a single ECG measurement."""
+class ECGMeasurement(NamedTuple):
+    """Represents a single ECG measurement.
+
+    A NamedTuple rather than a dataclass: instances carry no per-object
+    __dict__, which matters when the legacy shim allocates one per sample.
+    """
     timestamp: int
     microvolts: float
     data_quality: int
 
+def decode_ecg_frame(frame):
+    """Decode one raw PMD ECG frame into (microvolts, timestamp).
+
+    The 24-bit little-endian samples are decoded in a single vectorized
+    numpy pass: frombuffer over the payload, reshape to byte triples, and
+    sign-extended int32 assembly, then scaled to float32 microvolts.
+
+    Args:
+        frame: Raw notification payload (bytes-like)
+
+    Returns:
+        (float32 ndarray of microvolts, frame timestamp), or None if the
+        frame is not an ECG frame or carries no samples
+    """
+    frame = frame if isinstance(frame, memoryview) else memoryview(frame)
+
+    if frame[0] != 0x02:  # ECG frame type
+        return None
+
+    sample_count = (len(frame) - 3) // 3  # 3 bytes per sample
+    if sample_count <= 0:
+        return None
+
+    timestamp = _FRAME_TS_STRUCT.unpack_from(frame, 1)[0]
+
+    raw = np.frombuffer(frame, dtype=np.uint8, count=sample_count * 3, offset=3)
+    raw = raw.reshape(-1, 3)
+    samples = (raw[:, 0].astype(np.int32)
+               | (raw[:, 1].astype(np.int32) << 8)
+               | (raw[:, 2].astype(np.int8).astype(np.int32) << 16))
+    return samples.astype(np.float32) * ECG_SCALE_UV, timestamp
+
+def per_sample_adapter(callback: Callable[[ECGMeasurement], None]) -> Callable[[np.ndarray, int], None]:
+    """Wrap a legacy per-sample callback so it accepts batched frames.
+
+    Args:
+        callback: Function expecting one ECGMeasurement per sample
+
+    Returns:
+        A batch callback compatible with ECGHandler.start_streaming
+    """
+    def batch_callback(microvolts: np.ndarray, timestamp: int) -> None:
+        for value in microvolts:
+            callback(ECGMeasurement(timestamp=timestamp, microvolts=float(value), data_quality=1))
+    return batch_callback
+
 class ECGHandler:
     """Handles ECG measurements from Polar H10 device."""
-    
-    def __init__(self, client: BleakClient):
+
+    def __init__(self, client: BleakClient,
+                 pmd_service: str = PMD_SERVICE,
+                 pmd_control: str = PMD_CONTROL,
+                 pmd_data: str = PMD_DATA,
+                 dispatch_thread: bool = False,
+                 plot_callback: Optional[Callable[[np.ndarray], None]] = None,
+                 plot_points: int = 32):
         """Initialize the ECG handler.
-        
+
         Args:
             client: BleakClient instance for the connected Polar H10
+            pmd_service: UUID of the PMD service
+            pmd_control: UUID of the PMD control characteristic
+            pmd_data: UUID of the PMD data characteristic
+            dispatch_thread: Run the data callback on a dedicated worker
+                thread instead of inside the BLE notification handler, so
+                a slow consumer (plotting, disk) cannot stall the event
+                loop and drop notifications. Each frame is copied out of
+                the decode scratch before crossing the thread boundary.
+            plot_callback: Optional second consumer fed a strided view of
+                each decoded frame, decimated to about plot_points
+                samples. The display refreshes far below the 130 Hz
+                sample rate, so it gets a cheap stride over the already
+                decoded frame instead of a second decode. Same lifetime
+                caveat as the main callback: the view is into reused
+                scratch, so push it into an SPSCRing or copy it.
+            plot_points: Decimation target per frame for plot_callback
         """
         self._client = client
+        self._pmd_service = pmd_service
+        self._pmd_control = pmd_control
+        self._pmd_data = pmd_data
         self._streaming = False
-        self._callback: Optional[Callable[[ECGMeasurement], None]] = None
-        
-    async def start_streaming(self, callback: Callable[[ECGMeasurement], None]) -> None:
+        self._callback: Optional[Callable[[np.ndarray, int], None]] = None
+        # Preallocated decode scratch, reused for every frame so the hot
+        # path allocates nothing: two int32 work arrays plus the float32
+        # output the callback receives a view of.
+        self._scratch_lo = np.empty(_MAX_FRAME_SAMPLES, dtype=np.int32)
+        self._scratch_hi = np.empty(_MAX_FRAME_SAMPLES, dtype=np.int32)
+        self._scratch_out = np.empty(_MAX_FRAME_SAMPLES, dtype=np.float32)
+        self._dispatch_thread = dispatch_thread
+        self._plot_callback = plot_callback
+        self._plot_points = plot_points
+        self._frame_queue: Optional[queue.SimpleQueue] = None
+        self._worker: Optional[threading.Thread] = None
+
+    async def start_streaming(self, callback: Callable[[np.ndarray, int], None]) -> None:
         """Start ECG data streaming.
-        
+
         Args:
-            callback: Function to call with each ECG measurement
-            
+            callback: Function called with (microvolts, timestamp) per BLE
+                notification, where microvolts is a float32 array holding
+                every sample in the frame. The array is a view into a
+                reused decode buffer, valid only until the next frame;
+                copy it to retain samples. Use per_sample_adapter() to
+                keep a legacy per-ECGMeasurement callback working.
+
         Raises:
             ECGStreamError: If streaming fails to start
             ECGControlError: If control commands fail
         """
         if self._streaming:
             raise ECGStreamError("ECG streaming is already active")
-        
+
         try:
             # Enable ECG streaming via PMD Control characteristic
             ecg_control = bytearray([0x02, 0x00, 0x00, 0x01, 0x82, 0x00, 0x01, 0x01, 0x0E, 0x00])
-            await self._client.write_gatt_char(PMD_CONTROL, ecg_control)
-            
+            await self._client.write_gatt_char(self._pmd_control, ecg_control)
+
             # Set up notification handler
             self._callback = callback
-            await self._client.start_notify(PMD_DATA, self._handle_ecg_data)
-            
+            if self._dispatch_thread:
+                self._frame_queue = queue.SimpleQueue()
+                self._worker = threading.Thread(
+                    target=self._drain_frames, name="ecg-dispatch", daemon=True)
+                self._worker.start()
+            await self._client.start_notify(self._pmd_data, self._handle_ecg_data)
+
             self._streaming = True
             logger.info("ECG streaming started successfully")
-            
+
         except Exception as e:
             raise ECGStreamError(f"Failed to start ECG streaming: {str(e)}")
-        
+
     async def stop_streaming(self) -> None:
         """Stop ECG data streaming.
-        
+
         Raises:
             ECGStreamError: If streaming fails to stop
         """
         if not self._streaming:
             return
-            
+
         try:
             # Disable ECG streaming
             ecg_control = bytearray([0x02, 0x00, 0x00, 0x01, 0x82, 0x00, 0x01, 0x01, 0x00, 0x00])
-            await self._client.write_gatt_char(PMD_CONTROL, ecg_control)
-            
+            await self._client.write_gatt_char(self._pmd_control, ecg_control)
+
             # Stop notifications
-            await self._client.stop_notify(PMD_DATA)
-            
+            await self._client.stop_notify(self._pmd_data)
+
+            if self._worker:
+                self._frame_queue.put(None)  # Sentinel wakes and ends the worker
+                self._worker.join(timeout=1.0)
+                self._worker = None
+                self._frame_queue = None
+
             self._streaming = False
             self._callback = None
             logger.info("ECG streaming stopped successfully")
-            
+
         except Exception as e:
             raise ECGStreamError(f"Failed to stop ECG streaming: {str(e)}")
-        
+
     def _handle_ecg_data(self, _, data: bytearray) -> None:
         """Handle incoming ECG data.
-        
+
+        Decodes the frame into the handler's preallocated scratch arrays
+        and forwards the batch to the registered callback. The array the
+        callback receives is a view into scratch that the next frame
+        overwrites; callbacks that keep samples must copy.
+
         Args:
             _: Characteristic handle (unused)
             data: Raw ECG data from the device
         """
         if not self._callback:
             return
-            
+
         try:
-            # Parse frame type and sample count
-            frame_type = data[0]
-            if frame_type != 0x02:  # ECG frame type
+            decoded = self._decode_into_scratch(data)
+            if decoded is None:
                 return
-                
-            sample_count = (len(data) - 3) // 3  # 3 bytes per sample
-            
-            # Parse samples
-            for i in range(sample_count):
-                offset = 3 + (i * 3)
-                sample_bytes = data[offset:offset + 3]
-                
-                # Convert 24-bit signed int to microvolts
-                value = int.from_bytes(sample_bytes, byteorder='little', signed=True)
-                microvolts = value * 0.25  # Scale factor for Polar H10
-                
-                measurement = ECGMeasurement(
-                    timestamp=int.from_bytes(data[1:3], byteorder='little'),
-                    microvolts=microvolts,
-                    data_quality=1  # Default quality, can be enhanced
-                )
-                
-                self._callback(measurement)
-                
+            microvolts, timestamp = decoded
+            if self._plot_callback is not None:
+                # Strided view of the frame just decoded: the plot gets
+                # ~plot_points samples without a second pass or copy
+                stride = max(1, len(microvolts) // self._plot_points)
+                self._plot_callback(microvolts[::stride])
+            if self._frame_queue is not None:
+                # Copy out of scratch; the worker consumes at its own pace
+                self._frame_queue.put((microvolts.copy(), timestamp))
+            else:
+                self._callback(microvolts, timestamp)
+
         except Exception as e:
-            logger.error(f"Error processing ECG data: {str(e)}")
+            logger.error("Error processing ECG data: %s", e)
+
+    def _drain_frames(self) -> None:
+        """Worker loop delivering queued frames to the callback."""
+        while True:
+            item = self._frame_queue.get()
+            if item is None:
+                break
+            callback = self._callback
+            if callback is None:
+                continue
+            try:
+                callback(*item)
+            except Exception as e:
+                logger.error("Error in ECG data callback: %s", e)
+
+    def _decode_into_scratch(self, data):
+        """Decode a frame into the reusable scratch buffers.
+
+        Same vectorized decode as decode_ecg_frame, but every step writes
+        into preallocated arrays via out= so no temporaries are created.
+        Oversized frames fall back to the allocating path.
+
+        Returns:
+            (float32 view of microvolts, frame timestamp), or None for
+            non-ECG or empty frames
+        """
+        frame = data if isinstance(data, memoryview) else memoryview(data)
+
+        if frame[0] != 0x02:  # ECG frame type
+            return None
+
+        sample_count = (len(frame) - 3) // 3  # 3 bytes per sample
+        if sample_count <= 0:
+            return None
+        if sample_count > _MAX_FRAME_SAMPLES:
+            return decode_ecg_frame(frame)
+
+        timestamp = _FRAME_TS_STRUCT.unpack_from(frame, 1)[0]
+
+        raw = np.frombuffer(frame, dtype=np.uint8, count=sample_count * 3, offset=3)
+        raw = raw.reshape(-1, 3)
+        lo = self._scratch_lo[:sample_count]
+        hi = self._scratch_hi[:sample_count]
+        out = self._scratch_out[:sample_count]
+        np.copyto(lo, raw[:, 0])
+        np.copyto(hi, raw[:, 1])
+        np.left_shift(hi, 8, out=hi)
+        np.bitwise_or(lo, hi, out=lo)
+        np.copyto(hi, raw[:, 2].view(np.int8))  # sign-extending high byte
+        np.left_shift(hi, 16, out=hi)
+        np.bitwise_or(lo, hi, out=lo)
+        np.multiply(lo, ECG_SCALE_UV, out=out, casting='unsafe')
+        return out, timestamp
 
     @property
     def is_streaming(self) -> bool:
         """Return whether ECG streaming is active."""
         return self._streaming
-
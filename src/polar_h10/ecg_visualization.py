@@ -0,0 +1,148 @@
+import matplotlib.pyplot as plt
+import matplotlib.animation as animation
+import numpy as np
+
+class _SampleRing:
+    """Preallocated float ring buffer with deque-like len/iteration.
+
+    Appending past capacity overwrites the oldest sample in place; no
+    allocation happens after construction.
+    """
+
+    __slots__ = ('_data', '_head', '_count')
+
+    def __init__(self, capacity):
+        self._data = np.empty(capacity, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+
+    def append(self, value):
+        """Append one sample, evicting the oldest when full.
+
+        Raises:
+            ValueError: If value is not convertible to float
+        """
+        self._data[self._head] = value
+        capacity = self._data.shape[0]
+        self._head = (self._head + 1) % capacity
+        self._count = min(capacity, self._count + 1)
+
+    def extend(self, values):
+        """Append a batch of samples, evicting the oldest as needed."""
+        values = np.asarray(values, dtype=np.float64)
+        capacity = self._data.shape[0]
+        n = len(values)
+        if n == 0:
+            return
+        if n >= capacity:
+            # Only the trailing window survives; write it in one copy
+            self._data[:] = values[-capacity:]
+            self._head = 0
+            self._count = capacity
+            return
+        end = self._head + n
+        if end <= capacity:
+            self._data[self._head:end] = values
+        else:
+            split = capacity - self._head
+            self._data[self._head:] = values[:split]
+            self._data[:end - capacity] = values[split:]
+        self._head = end % capacity
+        self._count = min(capacity, self._count + n)
+
+    def array(self):
+        """Return the buffered samples oldest-first as a numpy array."""
+        if self._count < self._data.shape[0]:
+            return self._data[:self._count]
+        return np.concatenate((self._data[self._head:], self._data[:self._head]))
+
+    def clear(self):
+        """Drop all buffered samples."""
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return iter(self.array())
+
+class ECGVisualizer:
+    """Real-time ECG waveform visualization."""
+
+    def __init__(self, buffer_size=1000, update_interval=50, ring=None):
+        """Initialize the ECG visualizer.
+
+        Args:
+            buffer_size: Number of most recent samples kept for display
+            update_interval: Animation frame interval in milliseconds
+            ring: Optional SPSCRing the BLE side pushes samples into;
+                when given, each animation frame drains it instead of
+                relying on per-sample add_data_point calls
+
+        Raises:
+            ValueError: If buffer_size or update_interval is not positive
+        """
+        if buffer_size <= 0:
+            raise ValueError(f"buffer_size must be positive, got {buffer_size}")
+        if update_interval <= 0:
+            raise ValueError(f"update_interval must be positive, got {update_interval}")
+
+        self.buffer_size = buffer_size
+        self.update_interval = update_interval
+        self.data_buffer = _SampleRing(buffer_size)
+        self.ring = ring
+        self.is_running = False
+        self.animation = None
+
+        self.fig = plt.figure()
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set_title("Real-time ECG")
+        self.ax.set_xlabel("Sample")
+        self.ax.set_ylabel("Amplitude (uV)")
+        self.ax.grid(True)
+        self.line = self.ax.plot([], [], 'g-')[0]
+
+    def add_data_point(self, value):
+        """Add a single ECG sample to the display buffer.
+
+        Args:
+            value: Sample amplitude in microvolts
+
+        Raises:
+            ValueError: If value is not numeric
+        """
+        self.data_buffer.append(value)
+
+    def _update(self, _frame):
+        """Animation callback: push the current buffer onto the line."""
+        if self.ring is not None:
+            self.data_buffer.extend(self.ring.pop_many())
+        data = self.data_buffer.array()
+        self.line.set_data(np.arange(len(data)), data)
+        return (self.line,)
+
+    def start(self):
+        """Start the animation loop."""
+        self.animation = animation.FuncAnimation(
+            self.fig,
+            self._update,
+            interval=self.update_interval,
+            blit=True
+        )
+        self.is_running = True
+
+    def stop(self):
+        """Stop the animation loop."""
+        if self.animation is not None:
+            try:
+                self.animation.event_source.stop()
+            except AttributeError:
+                pass
+        self.is_running = False
+
+    def cleanup(self):
+        """Stop the animation and release buffered data."""
+        self.stop()
+        self.animation = None
+        self.data_buffer.clear()
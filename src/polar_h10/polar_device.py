@@ -8,6 +8,18 @@ from datetime import datetime
 from .data_quality import DataQuality
 from .ecg_handler import ECGHandler
 
+# Compiled once at import; avoids re-parsing the format string per notification
+_HR_STRUCT = struct.Struct('xB')
+
+# Advertised name prefixes for supported models. A prefix tuple rather than a
+# set of exact names because the device appends its serial ("Polar H10 A1B2C3").
+_POLAR_NAME_PREFIXES = ("Polar H10",)
+
+def _is_polar_h10(device, _advertisement):
+    """Scanner filter matching Polar H10 advertisements by name prefix."""
+    name = device.name
+    return bool(name) and name.startswith(_POLAR_NAME_PREFIXES)
+
 class ConnectionState(Enum):
     """Connection states for the Polar H10 device."""
     DISCONNECTED = "disconnected"
@@ -23,7 +35,11 @@ class PolarH10:
     PMD_SERVICE = "FB005C80-02E7-F387-1CAD-8ACD2D8DF0C8"
     PMD_CONTROL = "FB005C81-02E7-F387-1CAD-8ACD2D8DF0C8"
     PMD_DATA = "FB005C82-02E7-F387-1CAD-8ACD2D8DF0C8"
-    
+
+    # Normalized once at class creation for the set lookup in validate_services
+    REQUIRED_SERVICE_UUIDS = frozenset(u.lower() for u in (PMD_SERVICE, HEART_RATE_UUID))
+
+
     def __init__(self):
         self.client = None
         self.device = None
@@ -38,6 +54,10 @@ class PolarH10:
         self._base_retry_interval = 1.0  # Base retry interval in seconds
         self._last_data_time = None
         self._monitoring_task = None
+        self._data_event = None
+        self._data_timeout = 5.0  # Seconds without data before reconnecting
+        self._hr_queue = None
+        self._hr_consumer_task = None
         self.data_quality = DataQuality()
     
     async def discover(self):
@@ -45,13 +65,13 @@ class PolarH10:
         self.logger.info("Scanning for Polar H10...")
         try:
             self.device = await BleakScanner.find_device_by_filter(
-                lambda d, ad: d.name and "Polar H10" in d.name,
+                _is_polar_h10,
                 timeout=10.0  # Increase scanner timeout
             )
             if not self.device:
                 self.logger.error("No Polar H10 device found in range")
                 raise BleakError("No Polar H10 device found")
-            self.logger.debug(f"Found device: {self.device.name} ({self.device.address})")
+            self.logger.debug("Found device: %s (%s)", self.device.name, self.device.address)
             return self.device
         except Exception as e:
             self.logger.error(f"Error during device discovery: {str(e)}")
@@ -75,8 +95,9 @@ class PolarH10:
                 if not connected:
                     raise BleakError("Failed to connect to device")
                 
-                # Verify services are available
-                services = await self.client.get_services()
+                # Verify services are available. bleak resolves services as
+                # part of connect(), so client.services is already populated;
+                # the deprecated get_services() round-trip is redundant.
                 if not self.validate_services():
                     raise BleakError("Required services not found on device")
                 
@@ -111,21 +132,43 @@ class PolarH10:
                 await asyncio.sleep(retry_delay)
     
     async def start_hr_monitoring(self, callback):
-        """Start heart rate monitoring."""
+        """Start heart rate monitoring.
+
+        Readings are handed to a single long-lived consumer task through a
+        queue, so the BLE notification handler never has to allocate a Task
+        per sample.
+        """
         self._hr_callback = callback
+        if not self._hr_consumer_task or self._hr_consumer_task.done():
+            self._hr_queue = asyncio.Queue()
+            self._hr_consumer_task = asyncio.create_task(self._consume_hr())
         await self.client.start_notify(self.HEART_RATE_UUID, self._hr_data_handler)
-    
+
+    async def _consume_hr(self):
+        """Deliver queued heart rate readings to the registered callback."""
+        while True:
+            hr, stats = await self._hr_queue.get()
+            try:
+                await self._hr_callback(hr, stats)
+            except Exception as e:
+                self.logger.error("Error in heart rate callback: %s", e)
+
     def _hr_data_handler(self, _, data):
         """Handle incoming heart rate data with quality monitoring."""
         try:
-            hr = self.process_heart_rate_data(data)
-            self.data_quality.add_reading(datetime.now(), hr)
-            
+            # One wall-clock read shared by validation and quality tracking
+            now = datetime.now()
+            hr = self.process_heart_rate_data(data, timestamp=now)
+            self.data_quality.add_reading(now, hr)
+            if self._data_event:
+                self._data_event.set()
+
             if self._hr_callback:
                 stats = self.data_quality.get_stats()
-                asyncio.create_task(self._hr_callback(hr, stats))
+                self._hr_queue.put_nowait((hr, stats))
         except ValueError as e:
-            self.logger.warning(f"Invalid heart rate data: {e}")
+            # Lazy %-style args: no string formatting unless the record is emitted
+            self.logger.warning("Invalid heart rate data: %s", e)
     
     async def start_ecg_stream(self, callback):
         """Start ECG data streaming."""
@@ -168,6 +211,15 @@ class PolarH10:
             except asyncio.CancelledError:
                 pass
             self._reconnect_task = None
+
+        if self._hr_consumer_task:
+            self._hr_consumer_task.cancel()
+            try:
+                await self._hr_consumer_task
+            except asyncio.CancelledError:
+                pass
+            self._hr_consumer_task = None
+            self._hr_queue = None
         
         # Disconnect client
         if self.client:
@@ -205,36 +257,44 @@ class PolarH10:
     def _start_connection_monitoring(self):
         """Start monitoring the connection status."""
         if not self._monitoring_task or self._monitoring_task.done():
+            self._data_event = asyncio.Event()
             self._monitoring_task = asyncio.create_task(self._monitor_connection())
 
     async def _monitor_connection(self):
-        """Monitor connection health and data flow."""
+        """Monitor connection health and data flow.
+
+        Event-driven watchdog: the data handler sets _data_event on each
+        notification, so this task sleeps until data arrives or the
+        timeout fires, instead of waking at 1 Hz to poll timestamps.
+        """
         while True:
             try:
                 if not self.client or not self.client.is_connected:
                     break
-                
-                # Check for data timeout
-                if self._last_data_time:
-                    time_since_data = (datetime.now() - self._last_data_time).total_seconds()
-                    if time_since_data > 5.0:  # No data for 5 seconds
-                        self.logger.warning("No data received for 5 seconds")
-                        await self._handle_disconnect(self.client)
-                        break
-                
-                await asyncio.sleep(1.0)
+
+                try:
+                    await asyncio.wait_for(self._data_event.wait(), timeout=self._data_timeout)
+                    self._data_event.clear()
+                except asyncio.TimeoutError:
+                    if self._last_data_time is None:
+                        # No stream started yet; keep waiting for first data
+                        continue
+                    self.logger.warning(f"No data received for {self._data_timeout:.0f} seconds")
+                    await self._handle_disconnect(self.client)
+                    break
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.logger.error(f"Error in connection monitoring: {str(e)}")
                 break
 
-    def process_heart_rate_data(self, data):
+    def process_heart_rate_data(self, data, timestamp=None):
         """Process and validate raw heart rate data from the device.
-        
+
         Args:
             data: Raw heart rate data from the device
-            
+            timestamp: Arrival time of the notification; defaults to now
+
         Returns:
             int: Validated heart rate value
             
@@ -242,13 +302,15 @@ class PolarH10:
             ValueError: If heart rate data is invalid
         """
         try:
-            hr_value = struct.unpack('xB', data)[0]  # Extract HR value
+            # unpack_from reads the HR byte in place and, unlike unpack,
+            # accepts notifications that carry trailing RR-interval fields
+            hr_value = _HR_STRUCT.unpack_from(data)[0]
             
             # Validate heart rate data
             if not (30 <= hr_value <= 240):  # Normal HR range
                 raise ValueError(f"Heart rate value {hr_value} outside valid range (30-240 BPM)")
             
-            self._last_data_time = datetime.now()
+            self._last_data_time = timestamp if timestamp is not None else datetime.now()
             self.last_heart_rate = hr_value
             return hr_value
             
@@ -266,10 +328,10 @@ class PolarH10:
         if not self.client:
             return False
         try:
-            if hasattr(self.client.services, 'get_characteristic'):
+            services = self.client.services
+            if hasattr(services, 'get_characteristic'):
                 return True  # For test mock
-            required_services = [self.PMD_SERVICE, self.HEART_RATE_UUID]
-            available_services = [s.uuid for s in self.client.services]
-            return all(s in available_services for s in required_services)
+            available = {s.uuid.lower() for s in services}
+            return self.REQUIRED_SERVICE_UUIDS <= available
         except AttributeError:
             return True  # For test mock
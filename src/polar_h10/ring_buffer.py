@@ -0,0 +1,97 @@
+import numpy as np
+
+class SPSCRing:
+    """Lock-free single-producer/single-consumer sample ring buffer.
+
+    Intended to sit between the BLE notification handler (producer) and
+    the plotting thread (consumer) without a queue lock on the hot path.
+    It is safe without locking only under the SPSC contract: exactly one
+    thread calls push_many and exactly one thread calls pop_many. The
+    producer writes only _head and the consumer only _tail, each index
+    is published with a plain int store after its data copy completes,
+    and CPython's GIL orders those stores between threads.
+
+    One slot is kept empty so a full ring is distinguishable from an
+    empty one without a shared counter.
+    """
+
+    __slots__ = ('_buf', '_head', '_tail')
+
+    def __init__(self, capacity, dtype=np.float32):
+        """Initialize the ring.
+
+        Args:
+            capacity: Maximum number of buffered samples
+            dtype: numpy dtype of the sample storage
+
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self._buf = np.empty(capacity + 1, dtype=dtype)
+        self._head = 0
+        self._tail = 0
+
+    @property
+    def capacity(self):
+        """Maximum number of samples the ring can hold."""
+        return self._buf.shape[0] - 1
+
+    def __len__(self):
+        """Number of samples currently available to the consumer."""
+        return (self._head - self._tail) % self._buf.shape[0]
+
+    def push_many(self, samples):
+        """Producer side: copy a batch of samples into the ring.
+
+        Samples that do not fit are dropped rather than blocking — for a
+        live plot the freshest window matters, and stalling the BLE
+        notification handler would drop whole frames upstream instead.
+
+        Args:
+            samples: 1-D array-like of samples to enqueue
+
+        Returns:
+            Number of samples actually enqueued
+        """
+        samples = np.asarray(samples)
+        size = self._buf.shape[0]
+        head = self._head
+        free = (self._tail - head - 1) % size
+        count = min(len(samples), free)
+        if count == 0:
+            return 0
+        end = head + count
+        if end <= size:
+            self._buf[head:end] = samples[:count]
+        else:
+            split = size - head
+            self._buf[head:] = samples[:split]
+            self._buf[:end - size] = samples[split:count]
+        # Publish only after the copy so the consumer never sees
+        # half-written slots
+        self._head = end % size
+        return count
+
+    def pop_many(self):
+        """Consumer side: consume and return every available sample.
+
+        Returns:
+            numpy array of samples in arrival order; empty when the ring
+            has nothing buffered. The array owns its data, so the
+            producer reusing the slots cannot corrupt it.
+        """
+        size = self._buf.shape[0]
+        tail = self._tail
+        count = (self._head - tail) % size
+        if count == 0:
+            return np.empty(0, dtype=self._buf.dtype)
+        end = tail + count
+        if end <= size:
+            out = self._buf[tail:end].copy()
+        else:
+            out = np.concatenate((self._buf[tail:], self._buf[:end - size]))
+        # Free the slots only after the copy is out of the ring
+        self._tail = end % size
+        return out
@@ -1,22 +1,36 @@
+import time
+
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import numpy as np
 
 class HeartRateDisplay:
     """Real-time heart rate visualization."""
-    
-    def __init__(self, max_points=100):
+
+    def __init__(self, max_points=100, redraw_interval=0.1):
         """Initialize the heart rate display with a maximum number of points to show.
-        
+
         Args:
             max_points: Maximum number of data points to display at once
+            redraw_interval: Minimum seconds between canvas redraws; calls
+                to update_plot inside this window are dropped
         """
+        if max_points <= 0:
+            raise ValueError(f"max_points must be positive, got {max_points}")
+        self.redraw_interval = redraw_interval
+        self._last_draw = float('-inf')
         self.max_points = max_points
-        self.timestamps = []
-        self.heart_rates = []
+        # Ring buffers with a shared write head: appending past max_points
+        # overwrites the oldest slot instead of an O(n) list.pop(0)
+        self._t_buf = np.empty(max_points, dtype=np.float64)
+        self._hr_buf = np.empty(max_points, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self._next_time = 0
         self.fig = None
         self.ax = None
         self.line = None
+        self._background = None
         try:
             self.initialize_plot()
         except Exception as e:
@@ -33,49 +47,105 @@ class HeartRateDisplay:
             self.ax.set_ylabel("Heart Rate (BPM)")
             # Initialize with empty lists for x and y data
             plot_data = self.ax.plot([0], [0], 'b-', label='Heart Rate')
-            self.line = plot_data[0] 
+            self.line = plot_data[0]
+            # Animated artists are skipped by full draws, so the cached
+            # background stays line-free and blitting just repaints the line
+            self.line.set_animated(True)
+            self._background = None
             self.ax.grid(True)
             self.ax.legend()
         except Exception as e:
             raise RuntimeError(f"Failed to initialize plot: {e}")
     
+    @property
+    def timestamps(self):
+        """Buffered timestamps in chronological order."""
+        return self._ordered(self._t_buf)
+
+    @property
+    def heart_rates(self):
+        """Buffered heart rate values in chronological order."""
+        return self._ordered(self._hr_buf)
+
+    def _ordered(self, buf):
+        """Return the live portion of a ring buffer, oldest first."""
+        if self._count < self.max_points:
+            return buf[:self._count]
+        return np.concatenate((buf[self._head:], buf[:self._head]))
+
     def update_data(self, hr):
         """Update the data arrays with new heart rate value.
-        
+
         Args:
             hr: New heart rate value to add to the display
         """
-        self.heart_rates.append(hr)
-        if len(self.timestamps) == 0:
-            self.timestamps.append(0)
-        else:
-            self.timestamps.append(self.timestamps[-1] + 1)
-        
-        if len(self.timestamps) > self.max_points:
-            self.timestamps.pop(0)
-            self.heart_rates.pop(0)
+        self._t_buf[self._head] = self._next_time
+        self._hr_buf[self._head] = hr
+        self._head = (self._head + 1) % self.max_points
+        self._count = min(self.max_points, self._count + 1)
+        self._next_time += 1
 
     def clear_data(self):
         """Clear all stored data from the display."""
-        self.timestamps = []
-        self.heart_rates = []
+        self._head = 0
+        self._count = 0
+        self._next_time = 0
         if self.line is not None:
             self.line.set_data([], [])
 
     def update_plot(self):
         """Update the display with current data.
-        
+
         Should be called after update_data() to refresh the visualization.
+        Redraws are rate-limited to one per redraw_interval, and in steady
+        state only the line is blitted onto a cached background; a full
+        canvas draw happens only when the axis limits actually change.
         """
         if self.line is None or self.ax is None:
             return
-            
-        self.line.set_data(self.timestamps, self.heart_rates)
-        self.ax.relim()
-        self.ax.autoscale_view()
+
+        now = time.monotonic()
+        if now - self._last_draw < self.redraw_interval:
+            return
+        self._last_draw = now
+
+        timestamps = self.timestamps
+        heart_rates = self.heart_rates
+        self.line.set_data(timestamps, heart_rates)
+        canvas = self.fig.canvas
         try:
-            plt.draw()
-            plt.pause(0.01)
+            if self._rescale(timestamps, heart_rates) or self._background is None:
+                canvas.draw()
+                self._background = canvas.copy_from_bbox(self.ax.bbox)
+            else:
+                canvas.restore_region(self._background)
+            self.ax.draw_artist(self.line)
+            canvas.blit(self.ax.bbox)
+            canvas.flush_events()
         except Exception as e:
             print(f"Failed to update plot: {e}")
 
+    def _rescale(self, timestamps, heart_rates):
+        """Grow the axis limits in blocks when data runs off the plot.
+
+        Expanding in 30 s / 10 BPM steps instead of autoscaling per sample
+        keeps the limits - and therefore the blit background - stable for
+        long stretches.
+
+        Returns:
+            True when either axis limit changed
+        """
+        if len(timestamps) == 0:
+            return False
+        changed = False
+        xmin, xmax = self.ax.get_xlim()
+        if timestamps[-1] > xmax or timestamps[0] < xmin:
+            self.ax.set_xlim(timestamps[0], timestamps[-1] + 30)
+            changed = True
+        ymin, ymax = self.ax.get_ylim()
+        lo, hi = heart_rates.min(), heart_rates.max()
+        if lo < ymin or hi > ymax:
+            self.ax.set_ylim(min(ymin, lo - 10), max(ymax, hi + 10))
+            changed = True
+        return changed
+
@@ -0,0 +1,6 @@
+import matplotlib
+
+# Force the non-interactive Agg backend once for the whole session, before
+# any test module (or src.main) gets a chance to import pyplot. Individual
+# tests then never pay for, or depend on, an interactive backend.
+matplotlib.use('Agg', force=True)
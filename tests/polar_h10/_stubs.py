@@ -0,0 +1,40 @@
+"""Handwritten stubs for the ECG hot-path tests.
+
+Plain classes with ordinary method attributes: every call on a Mock goes
+through unittest.mock's attribute machinery, which is measurable overhead
+in tests that push many frames through the handler. Behavior recording is
+a list.append instead.
+"""
+
+
+class StubBleakClient:
+    """Minimal BleakClient stand-in recording GATT interactions."""
+
+    def __init__(self):
+        self.is_connected = True
+        self.writes = []
+        self.notify_starts = []
+        self.notify_stops = []
+        # When set, write_gatt_char raises it instead of recording
+        self.write_error = None
+
+    async def write_gatt_char(self, *args, **kwargs):
+        if self.write_error is not None:
+            raise self.write_error
+        self.writes.append((args, kwargs))
+
+    async def start_notify(self, uuid, handler):
+        self.notify_starts.append((uuid, handler))
+
+    async def stop_notify(self, uuid):
+        self.notify_stops.append(uuid)
+
+
+class RecordingCallback:
+    """Plain-callable frame callback that records each invocation."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *args):
+        self.calls.append(args)
@@ -0,0 +1,23 @@
+import pytest
+from unittest.mock import Mock, AsyncMock
+
+from polar_h10.polar_device import PolarH10
+
+@pytest.fixture
+def mock_client():
+    """Connected BleakClient stand-in shared by the device and ECG tests."""
+    client = Mock()
+    client.is_connected = True
+    client.write_gatt_char = AsyncMock()
+    client.start_notify = AsyncMock()
+    client.stop_notify = AsyncMock()
+    client.connect = AsyncMock(return_value=True)
+    client.disconnect = AsyncMock()
+    return client
+
+@pytest.fixture
+def polar(mock_client):
+    """PolarH10 wired to the shared mock client, as if already connected."""
+    device = PolarH10()
+    device.client = mock_client
+    return device
@@ -1,72 +1,114 @@
-import unittest
+import pytest
 import os
-import tempfile
 import csv
-import shutil
+import struct
 from datetime import datetime
-from polar_h10.data_logger import DataLogger
+from polar_h10.data_logger import (
+    DataLogger, BIN_MAGIC, HR_RECORD, ECG_RECORD, HR_TAG, ECG_TAG,
+)
 
-class TestDataLogger(unittest.TestCase):
+@pytest.fixture(scope='session')
+def log_root(tmp_path_factory):
+    """One log directory for the whole session; each test's logger starts
+    its own file inside it, so no per-test mkdtemp/rmtree is needed."""
+    return tmp_path_factory.mktemp('datalogger')
+
+@pytest.fixture
+def data_logger(log_root):
+    logger = DataLogger(str(log_root))
+    yield logger
+    logger.close()
+
+class TestDataLogger:
     """Test suite for data logging functionality."""
-    
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.logger = DataLogger(self.temp_dir)
 
-    def test_initialize_logger(self):
+    def test_initialize_logger(self, log_root):
         """Test logger initialization and directory creation."""
-        new_dir = os.path.join(self.temp_dir, 'test_logs')
+        new_dir = os.path.join(str(log_root), 'test_logs')
         logger = DataLogger(new_dir)
         assert os.path.exists(new_dir)
         assert logger.log_dir == new_dir
-    
-    def test_generate_filename(self):
+        logger.close()
+
+    def test_generate_filename(self, data_logger):
         """Test log filename generation."""
-        filename = self.logger.generate_filename()
+        filename = data_logger.generate_filename()
         assert filename.endswith('.csv')
         assert datetime.now().strftime('%Y%m%d') in filename
-    
-    def test_log_heart_rate(self):
+
+    def test_log_heart_rate(self, data_logger):
         """Test heart rate data logging."""
         test_hr = 75
-        self.logger.log_heart_rate(test_hr)
-        
-        with open(self.logger.current_file, 'r') as f:
+        data_logger.log_heart_rate(test_hr)
+        data_logger.flush()
+
+        with open(data_logger.current_file, 'r') as f:
             reader = csv.reader(f)
             next(reader)  # Skip header
             row = next(reader)
             assert int(row[1]) == test_hr
-    
-    def test_file_creation(self):
+
+    def test_file_creation(self, data_logger):
         """Test log file creation and header writing."""
-        self.logger.start_new_log()
-        assert os.path.exists(self.logger.current_file)
-        
-        with open(self.logger.current_file, 'r') as f:
+        data_logger.start_new_log()
+        assert os.path.exists(data_logger.current_file)
+
+        with open(data_logger.current_file, 'r') as f:
             header = f.readline().strip()
             assert header == "Timestamp,HeartRate"
-    
-    def test_multiple_entries(self):
+
+    def test_multiple_entries(self, data_logger):
         """Test logging multiple heart rate entries."""
         test_rates = [70, 75, 80]
         for rate in test_rates:
-            self.logger.log_heart_rate(rate)
-        
-        with open(self.logger.current_file, 'r') as f:
+            data_logger.log_heart_rate(rate)
+        data_logger.flush()
+
+        with open(data_logger.current_file, 'r') as f:
             reader = csv.reader(f)
             next(reader)  # Skip header
             logged_rates = [int(row[1]) for row in reader]
             assert logged_rates == test_rates
-    
-    def test_error_handling(self):
-        """Test error handling for file operations."""
-        # Test with invalid directory
-        with self.assertRaises(Exception):
-            DataLogger("/invalid/path/that/doesnt/exist")
-    
-    def tearDown(self):
-        """Clean up after each test method."""
-        shutil.rmtree(self.temp_dir)
-        self.logger = None
 
+    def test_log_ecg_frame(self, data_logger):
+        """Test frame-batched ECG logging shares one timestamp per frame."""
+        samples = [0.25, -0.25, 1.0]
+        data_logger.log_ecg_frame(samples)
+        data_logger.flush()
+
+        with open(data_logger.current_file, 'r') as f:
+            reader = csv.reader(f)
+            next(reader)  # Skip header
+            rows = list(reader)
+            assert [float(row[1]) for row in rows] == samples
+            assert len({row[0] for row in rows}) == 1
+
+    def test_binary_log_format(self, log_root):
+        """Test the packed binary format round-trips HR and ECG records."""
+        logger = DataLogger(str(log_root), binary=True)
+        logger.log_heart_rate(75)
+        logger.log_ecg_frame([0.25, -0.25])
+        logger.close()
+
+        assert logger.current_file.endswith('.bin')
+        with open(logger.current_file, 'rb') as f:
+            blob = f.read()
+        assert blob.startswith(BIN_MAGIC)
+        offset = len(BIN_MAGIC)
+        tag, _, hr = HR_RECORD.unpack_from(blob, offset)
+        assert (tag, hr) == (HR_TAG, 75)
+        offset += HR_RECORD.size
+        tag, _, count = ECG_RECORD.unpack_from(blob, offset)
+        assert (tag, count) == (ECG_TAG, 2)
+        offset += ECG_RECORD.size
+        samples = struct.unpack_from(f'<{count}f', blob, offset)
+        assert list(samples) == [0.25, -0.25]
+
+    def test_error_handling(self, tmp_path):
+        """Test error handling for file operations."""
+        # A path whose parent is a regular file fails even when running
+        # with privileges that could create arbitrary directories
+        blocker = tmp_path / 'not_a_dir'
+        blocker.write_text('')
+        with pytest.raises(Exception):
+            DataLogger(str(blocker / 'logs'))
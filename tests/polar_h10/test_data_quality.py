@@ -57,6 +57,27 @@ class TestDataQuality:
             quality_monitor.add_reading(now + timedelta(seconds=i), 75)
         assert len(quality_monitor.buffer) == 10
         
+    def test_window_anomaly_count(self, quality_monitor):
+        """Test windowed anomaly counting only sees buffered readings."""
+        now = datetime.now()
+        quality_monitor.add_reading(now, 250)  # Anomalous, will be evicted
+        for i in range(1, 11):  # Fill the 10-slot buffer with normal readings
+            quality_monitor.add_reading(now + timedelta(seconds=i), 75)
+        assert quality_monitor.window_anomaly_count() == 0
+        assert quality_monitor.get_stats()['anomalies'] >= 1
+
+    def test_window_scan(self, quality_monitor):
+        """Test the one-pass window scan counts gaps and anomalies."""
+        now = datetime.now()
+        quality_monitor.add_reading(now, 75)
+        quality_monitor.add_reading(now + timedelta(seconds=1), 76)
+        quality_monitor.add_reading(now + timedelta(seconds=5), 77)  # Gap
+        quality_monitor.add_reading(now + timedelta(seconds=6), 250)  # Anomaly
+        gaps, anomalies, quality = quality_monitor.window_scan()
+        assert gaps == 1
+        assert anomalies == 1
+        assert quality == 100.0 * (1.0 - 2 / 4)
+
     def test_clear_data(self, quality_monitor):
         """Test clearing of all data."""
         now = datetime.now()
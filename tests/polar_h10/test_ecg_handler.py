@@ -1,114 +1,170 @@
+import threading
+
 import pytest
-from unittest.mock import Mock, patch, call
 import numpy as np
-from polar_h10.ecg_handler import ECGHandler
+from polar_h10.ecg_handler import (
+    ECGHandler,
+    ECGMeasurement,
+    ECGStreamError,
+    PMD_CONTROL,
+    PMD_DATA,
+    per_sample_adapter,
+)
 from bleak.exc import BleakError
 
+from ._stubs import RecordingCallback, StubBleakClient
+
+def make_ecg_frame(*sample_bytes):
+    """Build a raw ECG frame: type byte, 2-byte timestamp, then samples."""
+    return bytearray([0x02, 0x34, 0x12]) + bytearray(sample_bytes)
+
+# Handwritten stubs instead of Mock: these tests push frames through the
+# hot path, and plain attribute access keeps them cheap (see _stubs.py)
 @pytest.fixture
 def mock_client():
-    client = Mock()
-    client.is_connected = True
-    return client
+    return StubBleakClient()
 
 @pytest.fixture
-def mock_callbacks():
-    return {
-        'data_callback': Mock(),
-        'error_callback': Mock(),
-        'connection_callback': Mock()
-    }
+def data_callback():
+    return RecordingCallback()
 
 @pytest.fixture
-def ecg_handler(mock_client, mock_callbacks):
-    handler = ECGHandler(
-        client=mock_client,
-        device_id="test_device",
-        data_callback=mock_callbacks['data_callback'],
-        error_callback=mock_callbacks['error_callback'],
-        connection_callback=mock_callbacks['connection_callback']
-    )
-    yield handler
-    handler.stop_streaming()
+def ecg_handler(mock_client):
+    return ECGHandler(mock_client)
 
 class TestECGHandler:
     def test_initialization(self, ecg_handler, mock_client):
-        assert ecg_handler.client == mock_client
-        assert ecg_handler.device_id == "test_device"
+        assert ecg_handler._client == mock_client
         assert not ecg_handler.is_streaming
-        
+
     @pytest.mark.asyncio
-    async def test_start_streaming_success(self, ecg_handler, mock_client):
-        mock_client.write_gatt_char.return_value = None
-        
-        await ecg_handler.start_streaming()
-        
+    async def test_start_streaming_success(self, ecg_handler, mock_client, data_callback):
+        await ecg_handler.start_streaming(data_callback)
+
         assert ecg_handler.is_streaming
-        assert mock_client.write_gatt_char.call_count == 2  # PMD control point and config
-        
+        assert len(mock_client.writes) == 1
+        assert mock_client.writes[0][0][0] == PMD_CONTROL
+        assert len(mock_client.notify_starts) == 1
+
     @pytest.mark.asyncio
-    async def test_stop_streaming(self, ecg_handler, mock_client):
-        mock_client.write_gatt_char.return_value = None
-        await ecg_handler.start_streaming()
-        
+    async def test_stop_streaming(self, ecg_handler, mock_client, data_callback):
+        await ecg_handler.start_streaming(data_callback)
+
         await ecg_handler.stop_streaming()
-        
+
         assert not ecg_handler.is_streaming
-        assert mock_client.write_gatt_char.call_count >= 3  # Including stop command
-        
-    def test_handle_ecg_data(self, ecg_handler, mock_callbacks):
-        # Simulate raw ECG data (example format)
-        raw_data = bytes([0x00, 0x01, 0x02, 0x03] * 4)  # 16 bytes of sample data
-        
-        ecg_handler._handle_ecg_data(raw_data)
-        
-        mock_callbacks['data_callback'].assert_called_once()
-        data = mock_callbacks['data_callback'].call_args[0][0]
-        assert isinstance(data, np.ndarray)
-        
+        assert mock_client.notify_stops == [PMD_DATA]
+
     @pytest.mark.asyncio
-    async def test_connection_lost(self, ecg_handler, mock_client, mock_callbacks):
-        mock_client.is_connected = False
-        
-        with pytest.raises(BleakError):
-            await ecg_handler.start_streaming()
-        
-        mock_callbacks['connection_callback'].assert_called_with(False)
-        
-    def test_invalid_data_format(self, ecg_handler, mock_callbacks):
-        invalid_data = bytes([0x00])  # Too short to be valid
-        
-        ecg_handler._handle_ecg_data(invalid_data)
-        
-        mock_callbacks['error_callback'].assert_called_once()
-        
+    async def test_handle_ecg_data(self, ecg_handler, data_callback):
+        await ecg_handler.start_streaming(data_callback)
+        # Two 24-bit little-endian samples: +1 and -1
+        raw_data = make_ecg_frame(0x01, 0x00, 0x00, 0xFF, 0xFF, 0xFF)
+
+        ecg_handler._handle_ecg_data(None, raw_data)
+
+        assert len(data_callback.calls) == 1
+        microvolts, timestamp = data_callback.calls[0]
+        assert isinstance(microvolts, np.ndarray)
+        assert microvolts.dtype == np.float32
+        np.testing.assert_array_equal(microvolts, [0.25, -0.25])
+        assert timestamp == 0x1234
+
+    @pytest.mark.asyncio
+    async def test_ignores_non_ecg_frames(self, ecg_handler, data_callback):
+        await ecg_handler.start_streaming(data_callback)
+
+        ecg_handler._handle_ecg_data(None, bytearray([0x01, 0x00, 0x00, 0x01, 0x00, 0x00]))
+
+        assert not data_callback.calls
+
     @pytest.mark.asyncio
-    async def test_multiple_start_calls(self, ecg_handler, mock_client):
-        mock_client.write_gatt_char.return_value = None
-        
-        await ecg_handler.start_streaming()
-        await ecg_handler.start_streaming()  # Second call
-        
-        # Should only initialize once
-        assert mock_client.write_gatt_char.call_count == 2
-        
+    async def test_invalid_data_format(self, ecg_handler, data_callback):
+        await ecg_handler.start_streaming(data_callback)
+
+        # Too short to contain any samples; must not raise or fire the callback
+        ecg_handler._handle_ecg_data(None, bytearray([0x02]))
+
+        assert not data_callback.calls
+
     @pytest.mark.asyncio
-    async def test_error_handling_during_write(self, ecg_handler, mock_client, mock_callbacks):
-        mock_client.write_gatt_char.side_effect = BleakError("Mock error")
-        
-        with pytest.raises(BleakError):
-            await ecg_handler.start_streaming()
-        
-        mock_callbacks['error_callback'].assert_called_once()
+    async def test_multiple_start_calls(self, ecg_handler, mock_client, data_callback):
+        await ecg_handler.start_streaming(data_callback)
+
+        with pytest.raises(ECGStreamError):
+            await ecg_handler.start_streaming(data_callback)
+
+        # Only the first call should have written the control command
+        assert len(mock_client.writes) == 1
+
+    @pytest.mark.asyncio
+    async def test_error_handling_during_write(self, ecg_handler, mock_client, data_callback):
+        mock_client.write_error = BleakError("Stub error")
+
+        with pytest.raises(ECGStreamError):
+            await ecg_handler.start_streaming(data_callback)
+
         assert not ecg_handler.is_streaming
-        
-    def test_data_validation(self, ecg_handler, mock_callbacks):
-        # Test with valid data format
-        valid_data = bytes([0x00, 0x01, 0x02, 0x03] * 4)
-        ecg_handler._handle_ecg_data(valid_data)
-        assert mock_callbacks['error_callback'].call_count == 0
-        
-        # Test with invalid data format
-        invalid_data = bytes([0x00, 0x01])
-        ecg_handler._handle_ecg_data(invalid_data)
-        assert mock_callbacks['error_callback'].call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_decode_reuses_scratch_buffer(self, ecg_handler, data_callback):
+        await ecg_handler.start_streaming(data_callback)
+
+        ecg_handler._handle_ecg_data(None, make_ecg_frame(0x01, 0x00, 0x00))
+        first = data_callback.calls[-1][0]
+        assert np.shares_memory(first, ecg_handler._scratch_out)
+
+        ecg_handler._handle_ecg_data(None, make_ecg_frame(0x02, 0x00, 0x00))
+        second = data_callback.calls[-1][0]
+        np.testing.assert_array_equal(second, [0.5])
+        # Same backing storage: the previous view now holds the new frame
+        np.testing.assert_array_equal(first, [0.5])
+
+    @pytest.mark.asyncio
+    async def test_dispatch_thread_delivery(self, mock_client):
+        handler = ECGHandler(mock_client, dispatch_thread=True)
+        received = []
+        delivered = threading.Event()
+
+        def on_frame(microvolts, timestamp):
+            received.append((microvolts.copy(), timestamp, threading.get_ident()))
+            delivered.set()
+
+        await handler.start_streaming(on_frame)
+        handler._handle_ecg_data(None, make_ecg_frame(0x01, 0x00, 0x00))
+        assert delivered.wait(timeout=2.0)
+        await handler.stop_streaming()
+
+        microvolts, timestamp, thread_ident = received[0]
+        np.testing.assert_array_equal(microvolts, [0.25])
+        assert timestamp == 0x1234
+        assert thread_ident != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_plot_callback_decimation(self, mock_client, data_callback):
+        plot_callback = RecordingCallback()
+        handler = ECGHandler(mock_client, plot_callback=plot_callback, plot_points=2)
+        await handler.start_streaming(data_callback)
+        # Four samples: 1..4 raw, i.e. 0.25..1.0 microvolts
+        raw_data = make_ecg_frame(0x01, 0x00, 0x00, 0x02, 0x00, 0x00,
+                                  0x03, 0x00, 0x00, 0x04, 0x00, 0x00)
+
+        handler._handle_ecg_data(None, raw_data)
+
+        # Both consumers fire off the single decode pass
+        assert len(data_callback.calls) == 1
+        np.testing.assert_array_equal(data_callback.calls[0][0], [0.25, 0.5, 0.75, 1.0])
+        assert len(plot_callback.calls) == 1
+        np.testing.assert_array_equal(plot_callback.calls[0][0], [0.25, 0.75])  # stride 2
+
+    @pytest.mark.asyncio
+    async def test_per_sample_adapter(self, ecg_handler):
+        measurements = []
+        await ecg_handler.start_streaming(per_sample_adapter(measurements.append))
+        raw_data = make_ecg_frame(0x04, 0x00, 0x00, 0x08, 0x00, 0x00)
+
+        ecg_handler._handle_ecg_data(None, raw_data)
+
+        assert [m.microvolts for m in measurements] == [1.0, 2.0]
+        assert all(isinstance(m, ECGMeasurement) for m in measurements)
+        assert all(m.timestamp == 0x1234 for m in measurements)
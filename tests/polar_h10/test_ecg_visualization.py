@@ -1,5 +1,6 @@
 import pytest
 import numpy as np
+import matplotlib.lines
 from unittest.mock import MagicMock, patch
 from src.polar_h10.ecg_visualization import ECGVisualizer
 
@@ -14,15 +15,16 @@ def mock_figure():
 
 @pytest.fixture
 def mock_line():
-    line = MagicMock()
+    # Spec'd so isinstance(line, Artist) holds when blitting draws the frame
+    line = MagicMock(spec=matplotlib.lines.Line2D)
     line.set_data = MagicMock()
     return line
 
 @pytest.fixture
-def visualizer(mock_figure):
+def visualizer(mock_figure, mock_line):
     with patch('matplotlib.animation.FuncAnimation'):
         viz = ECGVisualizer(buffer_size=1000, update_interval=50)
-        viz.line = mock_line()
+        viz.line = mock_line
         return viz
 
 def test_initialization(visualizer):
@@ -1,69 +1,89 @@
-import unittest
-from unittest.mock import Mock, patch, AsyncMock
 import pytest
-from polar_h10.polar_device import PolarH10
+from unittest.mock import Mock, AsyncMock, patch
+from polar_h10.polar_device import PolarH10, ConnectionState, _is_polar_h10
 
-class TestPolarH10(unittest.TestCase):
+class TestPolarH10:
     """Test suite for PolarH10 BLE device operations."""
-    
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.device = PolarH10()
-        self.mock_client = Mock()
-        self.device.client = self.mock_client
-    
-    @patch('polar_h10.polar_device.BleakClient')
-    async def test_device_discovery(self, mock_bleak):
+
+    @pytest.mark.asyncio
+    async def test_device_discovery(self, polar):
         """Test device discovery functionality."""
         mock_device = Mock()
         mock_device.address = "00:11:22:33:44:55"
-        mock_device.name = "Polar H10"
-        mock_bleak.discover.return_value = [mock_device]
-        
-        device = await self.device.discover_device()
-        assert device is not None
+        mock_device.name = "Polar H10 12345678"
+
+        with patch('polar_h10.polar_device.BleakScanner') as mock_scanner:
+            mock_scanner.find_device_by_filter = AsyncMock(return_value=mock_device)
+            device = await polar.discover()
+
+        assert device is mock_device
         assert device.address == "00:11:22:33:44:55"
-    
-    @patch('polar_h10.polar_device.BleakClient')
-    async def test_connect_device(self, mock_bleak):
+
+    def test_discovery_name_filter(self):
+        """Test the scanner predicate matches Polar H10 names only."""
+        named = Mock()
+        named.name = "Polar H10 A1B2C3"
+        other = Mock()
+        other.name = "Some Other Sensor"
+        unnamed = Mock()
+        unnamed.name = None
+
+        assert _is_polar_h10(named, None)
+        assert not _is_polar_h10(other, None)
+        assert not _is_polar_h10(unnamed, None)
+
+    @pytest.mark.asyncio
+    async def test_connect_device(self, polar, mock_client):
         """Test device connection handling."""
-        mock_bleak.return_value = self.mock_client
-        self.mock_client.connect.return_value = True
-        
-        result = await self.device.connect()
+        polar.device = Mock()
+        polar.device.name = "Polar H10 12345678"
+
+        with patch('polar_h10.polar_device.BleakClient', return_value=mock_client):
+            result = await polar.connect()
+
         assert result is True
-        self.mock_client.connect.assert_called_once()
-    
-    async def test_disconnect_device(self):
+        mock_client.connect.assert_awaited_once()
+        assert polar._connection_state == ConnectionState.CONNECTED
+        await polar.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_device(self, polar, mock_client):
         """Test device disconnection."""
-        self.mock_client.disconnect.return_value = True
-        
-        await self.device.disconnect()
-        self.mock_client.disconnect.assert_called_once()
-    
-    @patch('polar_h10.polar_device.BleakClient')
-    async def test_start_heart_rate_stream(self, mock_bleak):
+        await polar.disconnect()
+
+        mock_client.disconnect.assert_awaited_once()
+        assert polar._connection_state == ConnectionState.DISCONNECTED
+
+    @pytest.mark.asyncio
+    async def test_start_heart_rate_stream(self, polar, mock_client):
         """Test heart rate data streaming."""
-        mock_callback = AsyncMock()
-        self.device.heart_rate_callback = mock_callback
-        
-        await self.device.start_heart_rate_stream()
-        self.mock_client.start_notify.assert_called_once()
-    
-    def test_process_heart_rate_data(self):
+        callback = AsyncMock()
+
+        await polar.start_hr_monitoring(callback)
+
+        mock_client.start_notify.assert_awaited_once()
+        assert polar._hr_consumer_task is not None
+        await polar.disconnect()
+
+    def test_process_heart_rate_data(self, polar):
         """Test heart rate data processing."""
         test_data = bytearray([0x00, 0x65])  # Heart rate of 101
-        self.device.process_heart_rate_data(test_data)
-        assert self.device.last_heart_rate == 101
-    
-    def test_validate_services(self):
+        polar.process_heart_rate_data(test_data)
+        assert polar.last_heart_rate == 101
+
+    def test_process_heart_rate_data_with_rr_fields(self, polar):
+        """Test notifications carrying trailing RR intervals still parse."""
+        test_data = bytearray([0x10, 0x48, 0x34, 0x02])  # HR 72 + one RR field
+        assert polar.process_heart_rate_data(test_data) == 72
+
+    def test_process_heart_rate_data_invalid(self, polar):
+        """Test heart rate values outside the plausible range are rejected."""
+        with pytest.raises(ValueError):
+            polar.process_heart_rate_data(bytearray([0x00, 0xFF]))  # 255 BPM
+
+    def test_validate_services(self, polar, mock_client):
         """Test service validation."""
-        self.mock_client.services = Mock()
-        self.mock_client.services.get_characteristic.return_value = True
-        
-        assert self.device.validate_services() is True
-    
-    def tearDown(self):
-        """Clean up after each test method."""
-        self.device = None
+        mock_client.services = Mock()
+        mock_client.services.get_characteristic.return_value = True
 
+        assert polar.validate_services() is True
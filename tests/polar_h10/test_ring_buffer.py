@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+import numpy as np
+from polar_h10.ring_buffer import SPSCRing
+
+class TestSPSCRing:
+    """Test suite for the single-producer/single-consumer ring buffer."""
+
+    def test_invalid_capacity(self):
+        with pytest.raises(ValueError):
+            SPSCRing(0)
+
+    def test_empty_pop(self):
+        ring = SPSCRing(8)
+        assert len(ring) == 0
+        assert len(ring.pop_many()) == 0
+
+    def test_push_pop_roundtrip(self):
+        ring = SPSCRing(8)
+        assert ring.push_many([1.0, 2.0, 3.0]) == 3
+        assert len(ring) == 3
+        np.testing.assert_array_equal(ring.pop_many(), [1.0, 2.0, 3.0])
+        assert len(ring) == 0
+
+    def test_wraparound(self):
+        ring = SPSCRing(4)
+        for batch in ([1.0, 2.0, 3.0], [4.0, 5.0], [6.0, 7.0, 8.0]):
+            ring.push_many(batch)
+            np.testing.assert_array_equal(ring.pop_many(), batch)
+
+    def test_overflow_drops_newest(self):
+        ring = SPSCRing(4)
+        assert ring.push_many([1.0, 2.0, 3.0]) == 3
+        assert ring.push_many([4.0, 5.0, 6.0]) == 1  # Only one slot left
+        np.testing.assert_array_equal(ring.pop_many(), [1.0, 2.0, 3.0, 4.0])
+
+    def test_popped_data_survives_reuse(self):
+        ring = SPSCRing(4)
+        ring.push_many([1.0, 2.0])
+        popped = ring.pop_many()
+        ring.push_many([9.0, 9.0, 9.0, 9.0])
+        np.testing.assert_array_equal(popped, [1.0, 2.0])
+
+    def test_threaded_producer_consumer(self):
+        """Every pushed sample arrives exactly once, in order."""
+        ring = SPSCRing(64)
+        total = 5000
+        received = []
+
+        def produce():
+            sent = 0
+            while sent < total:
+                batch = np.arange(sent, min(sent + 13, total), dtype=np.float32)
+                sent += ring.push_many(batch)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        while len(received) < total:
+            received.extend(ring.pop_many())
+        producer.join()
+
+        np.testing.assert_array_equal(received, np.arange(total))
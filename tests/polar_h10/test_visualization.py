@@ -1,56 +1,66 @@
-import unittest
-from unittest.mock import Mock, patch
-import numpy as np
+import pytest
+from unittest.mock import patch
 import matplotlib.pyplot as plt
 from polar_h10.visualization import HeartRateDisplay
 
-class TestHeartRateDisplay(unittest.TestCase):
+@pytest.fixture
+def display():
+    display = HeartRateDisplay()
+    yield display
+    plt.close('all')
+
+class TestHeartRateDisplay:
     """Test suite for heart rate visualization functionality."""
-    
-    def setUp(self):
-        """Set up test fixtures before each test method."""
-        self.display = HeartRateDisplay()
-        plt.ion()
-
-    @patch('matplotlib.pyplot.figure')
-    def test_initialize_plot(self, mock_figure):
+
+    def test_initialize_plot(self, display):
         """Test plot initialization and setup."""
-        self.display.initialize_plot()
-        assert self.display.fig is not None
-        assert self.display.ax is not None
-        assert self.display.line is not None
-    
-    def test_update_data(self):
+        display.initialize_plot()
+        assert display.fig is not None
+        assert display.ax is not None
+        assert display.line is not None
+
+    def test_update_data(self, display):
         """Test data update mechanism."""
-        initial_length = len(self.display.heart_rates)
-        self.display.update_data(75)
-        assert len(self.display.heart_rates) == initial_length + 1
-        assert self.display.heart_rates[-1] == 75
-    
-    def test_max_points_limit(self):
+        initial_length = len(display.heart_rates)
+        display.update_data(75)
+        assert len(display.heart_rates) == initial_length + 1
+        assert display.heart_rates[-1] == 75
+
+    def test_max_points_limit(self, display):
         """Test maximum points limitation in the plot."""
-        max_points = self.display.max_points
+        max_points = display.max_points
         for i in range(max_points + 10):
-            self.display.update_data(i)
-        assert len(self.display.heart_rates) <= max_points
-    
-    @patch('matplotlib.pyplot.draw')
-    def test_update_plot(self, mock_draw):
-        """Test plot update functionality."""
-        self.display.initialize_plot()
-        self.display.update_data(70)
-        self.display.update_plot()
-        mock_draw.assert_called_once()
-    
-    def test_clear_data(self):
-        """Test data clearing functionality."""
-        self.display.update_data(70)
-        self.display.clear_data()
-        assert len(self.display.heart_rates) == 0
-        assert len(self.display.timestamps) == 0
-    
-    def tearDown(self):
-        """Clean up after each test method."""
-        plt.close('all')
-        self.display = None
+            display.update_data(i)
+        assert len(display.heart_rates) <= max_points
+
+    def test_update_plot(self, display):
+        """Test the first update performs a full draw to prime the background."""
+        display.update_data(70)
+        canvas = display.fig.canvas
+        with patch.object(canvas, 'draw', wraps=canvas.draw) as mock_draw:
+            display.update_plot()
+            mock_draw.assert_called_once()
+        assert display._background is not None
 
+    def test_update_plot_blits_when_limits_stable(self):
+        """Test steady-state updates blit instead of redrawing the canvas."""
+        display = HeartRateDisplay(redraw_interval=0)
+        try:
+            display.update_data(70)
+            display.update_plot()  # Primes the cached background
+            display.update_data(71)
+            canvas = display.fig.canvas
+            with patch.object(canvas, 'draw', wraps=canvas.draw) as mock_draw, \
+                 patch.object(canvas, 'blit', wraps=canvas.blit) as mock_blit:
+                display.update_plot()
+                mock_draw.assert_not_called()
+                mock_blit.assert_called_once()
+        finally:
+            plt.close('all')
+
+    def test_clear_data(self, display):
+        """Test data clearing functionality."""
+        display.update_data(70)
+        display.clear_data()
+        assert len(display.heart_rates) == 0
+        assert len(display.timestamps) == 0